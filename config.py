@@ -3,29 +3,85 @@ Configuration file for Habit Monitor CLI
 """
 
 import os
+import json
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+_env = os.environ
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_ENV_FILE = os.path.join(_BASE_DIR, ".env")
+_ENV_CACHE_FILE = os.path.join(_BASE_DIR, ".env.cache.json")
+
+
+def _load_env():
+    """Load .env, using the cache from `python -m lib._env_cache` when fresh"""
+    try:
+        with open(_ENV_CACHE_FILE) as f:
+            cache = json.load(f)
+        if cache["mtime"] == os.stat(_ENV_FILE).st_mtime:
+            # Same precedence as load_dotenv(): existing variables win
+            for key, value in cache["env"].items():
+                if value is not None:
+                    _env.setdefault(key, value)
+            return
+    except (OSError, ValueError, KeyError):
+        pass
+    load_dotenv()
+
+
+# Load environment variables from .env file (only once per process, even if
+# this module is reloaded by a test runner or reloader)
+_DOTENV_LOADED = globals().get("_DOTENV_LOADED", False)
+if not _DOTENV_LOADED:
+    _load_env()
+    _DOTENV_LOADED = True
+
+
+def _get(key, default=None, cast=str):
+    """Read an environment variable, casting it when it is set"""
+    value = _env.get(key)
+    return cast(value) if value is not None else default
+
+
+_TRUE_STRINGS = frozenset({"1", "true", "yes", "on"})
+_FALSE_STRINGS = frozenset({"0", "false", "no", "off"})
+
+
+def _bool(value):
+    """Cast an environment string to bool (1/true/yes/on or 0/false/no/off, any case)"""
+    normalized = value.strip().lower()
+    if normalized in _TRUE_STRINGS:
+        return True
+    if normalized in _FALSE_STRINGS:
+        return False
+    # Fail like the int/float casts do, rather than silently picking False
+    raise ValueError(f"Invalid boolean value {value!r}; use true/false, yes/no, on/off or 1/0")
+
 
 # Roboflow Configuration
-ROBOFLOW_API_KEY = os.environ["ROBOFLOW_API_KEY"]
-WORKSPACE_NAME = os.getenv("WORKSPACE_NAME")
-WORKFLOW_ID = os.getenv("WORKFLOW_ID")
+ROBOFLOW_API_KEY = _env["ROBOFLOW_API_KEY"]
+WORKSPACE_NAME = _get("WORKSPACE_NAME")
+WORKFLOW_ID = _get("WORKFLOW_ID")
 
 # Detection Settings
-CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.5"))  # Confidence threshold for habit detection (0.0 - 1.0)
+CONFIDENCE_THRESHOLD = _get("CONFIDENCE_THRESHOLD", 0.5, float)  # Confidence threshold for habit detection (0.0 - 1.0)
 
 # Camera Settings
-CAMERA_FPS = int(os.getenv("CAMERA_FPS", "15"))           # Camera frames per second
+CAMERA_FPS = _get("CAMERA_FPS", 15, int)           # Camera frames per second
+CAMERA_INDEX = _get("CAMERA_INDEX", 0, int)        # Video device index (0 = default webcam)
 
 # Audio Settings
 
-AUDIO_WARNING_COOLDOWN = float(os.getenv("AUDIO_WARNING_COOLDOWN", "5"))    # Seconds to wait between audio warnings
+AUDIO_ENABLED = _get("AUDIO_ENABLED", True, _bool)    # Set to false to disable audio warnings
+AUDIO_WARNING_COOLDOWN = _get("AUDIO_WARNING_COOLDOWN", 5.0, float)    # Seconds to wait between audio warnings
+AUDIO_PCM_PLAYBACK = _get("AUDIO_PCM_PLAYBACK", False, _bool)    # Preload sounds as PCM and play via sounddevice
 
 # Display Settings
-REFRESH_RATE = float(os.getenv("REFRESH_RATE", "1.0"))        # Seconds between display updates
+REFRESH_RATE = _get("REFRESH_RATE", 1.0, float)        # Seconds between display updates
 
 # Logging Settings
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")        # DEBUG, INFO, WARNING, ERROR
-# Note: Logging always enabled with timestamped files in logs/ directory 
\ No newline at end of file
+LOG_LEVEL = _get("LOG_LEVEL", "INFO")        # DEBUG, INFO, WARNING, ERROR
+# Note: Logging always enabled with timestamped files in logs/ directory
+
+# All uppercase settings above, collected once for HabitMonitor(config=...)
+CONFIG_DICT = {k: v for k, v in list(globals().items()) if k.isupper() and not k.startswith('_')}
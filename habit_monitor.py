@@ -5,17 +5,9 @@ Habit Monitor CLI - Real-time webcam monitoring for bad habits using Roboflow wo
 
 import click
 import sys
-import os
-from colorama import init
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
-
-# Add lib directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'lib'))
-
-from lib import HabitMonitor
-import config
+# Heavy imports (lib, config) are deferred into main() so that
+# --help is handled by click without loading OpenCV/inference
 
 @click.command()
 def main():
@@ -28,7 +20,7 @@ def main():
     - WORKFLOW_ID: Your workflow ID for habit detection
     - CONFIDENCE_THRESHOLD: Confidence threshold (0.0-1.0)
     """
-    from colorama import Fore
+    import config
     
     # Validate required environment variables
     required_vars = {
@@ -39,16 +31,17 @@ def main():
     
     for var_name, var_value in required_vars.items():
         if not var_value or var_value == "your-api-key-here":
+            # Colored output is only needed on this error path
+            from colorama import init, Fore
+            init(autoreset=True)
             print(f"{Fore.RED}❌ {var_name} is not set or invalid in .env file")
             print(f"{Fore.RED}Please set it in your .env file: {var_name}=your-value")
             sys.exit(1)
     
-    # Create configuration dictionary from config module
-    config_dict = {
-        key: getattr(config, key) 
-        for key in dir(config) 
-        if not key.startswith('_') and key.isupper()
-    }
+    from lib import HabitMonitor
+    
+    # Configuration dictionary precomputed by the config module
+    config_dict = config.CONFIG_DICT
     
     # Create monitor instance with fixed values
     monitor = HabitMonitor(
@@ -0,0 +1,34 @@
+"""
+Build step that snapshots .env into .env.cache.json so config.py can skip
+python-dotenv parsing at startup
+
+Run from the project root after editing .env:
+    python -m lib._env_cache
+"""
+
+import os
+import json
+from dotenv import dotenv_values
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FILE = os.path.join(PROJECT_ROOT, ".env")
+CACHE_FILE = os.path.join(PROJECT_ROOT, ".env.cache.json")
+
+
+def write_env_cache(env_file=ENV_FILE, cache_file=CACHE_FILE):
+    """Parse env_file once and write its values plus mtime to cache_file"""
+    with open(env_file) as f:
+        pairs = dotenv_values(stream=f)
+    
+    cache = {
+        "mtime": os.stat(env_file).st_mtime,
+        "env": pairs
+    }
+    with open(cache_file, "w") as f:
+        json.dump(cache, f)
+    
+    return cache_file
+
+
+if __name__ == "__main__":
+    print(f"Wrote {write_env_cache()}")
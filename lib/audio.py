@@ -3,57 +3,209 @@ Audio manager for habit detection warnings (macOS only)
 """
 
 import os
+import sys
 import time
+import queue
+import shutil
 import logging
-from threading import Lock
+import subprocess
+from threading import Thread
+
+try:
+    from AVFoundation import AVAudioPlayer
+    from Foundation import NSURL
+except ImportError:
+    # pyobjc is unavailable (non-macOS or not installed); fall back to afplay
+    AVAudioPlayer = None
+
+# Project root directory (parent of lib/)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Different custom sounds for different habits with absolute paths
+_SOUND_MAP = {
+    "about-to-chomp": os.path.join(_PROJECT_ROOT, "audio", "about-to-chomp.mp3"),
+    "chomping": os.path.join(_PROJECT_ROOT, "audio", "chomping.mp3"),
+    "pondering": os.path.join(_PROJECT_ROOT, "audio", "pondering.mp3"),
+    "default": "/System/Library/Sounds/Ping.aiff"
+}
+
+# Sentinel for "no warning played yet"; always further back than any cooldown
+_NEVER_NS = -(1 << 63)
 
 
 class AudioManager:
     """Handles audio warnings for habit detection on macOS"""
     
-    def __init__(self, cooldown_seconds=5):
+    __slots__ = (
+        "enabled", "logger", "_cooldown_ns", "_last_warning_ns", "_sd", "_pcm",
+        "_players", "_player_cmd", "_q", "_worker"
+    )
+    
+    def __init__(self, cooldown_seconds=5, use_pcm=False, enabled=True):
+        self.enabled = enabled
         self.cooldown_seconds = cooldown_seconds
-        self.last_warning_time = 0
-        self.warning_lock = Lock()
+        self._last_warning_ns = _NEVER_NS
         self.logger = logging.getLogger(__name__)
         
-        # Get the project root directory (parent of lib/)
-        self.project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self._sd = None
+        self._pcm = {}
+        self._players = {}
+        self._player_cmd = None
+        self._q = None
+        self._worker = None
+        
+        # Disabled audio never loads sounds or starts the worker thread
+        if not enabled:
+            return
+        
+        # Optionally decode every sound to PCM up front and play it through
+        # sounddevice; opt-in because it needs PortAudio/libsndfile
+        if use_pcm:
+            self._pcm = self._load_pcm()
+        
+        # Decode each sound once so playback is a single non-blocking call
+        self._players = self._load_players()
+        
+        # Resolve the command-line player once instead of probing per warning
+        self._player_cmd = shutil.which("afplay")
+        
+        # Single background worker so playback never blocks the detection loop;
+        # the queue holds at most one pending warning and extras are dropped
+        self._q = queue.Queue(maxsize=1)
+        self._worker = Thread(target=self._audio_loop, daemon=True)
+        self._worker.start()
+    
+    @property
+    def cooldown_seconds(self):
+        """Seconds to wait between audio warnings"""
+        return self._cooldown_ns / 1_000_000_000
+    
+    @cooldown_seconds.setter
+    def cooldown_seconds(self, seconds):
+        # Stored as integer nanoseconds for the per-frame cooldown compare
+        self._cooldown_ns = int(seconds * 1_000_000_000)
+    
+    @property
+    def last_warning_time(self):
+        """Monotonic time (seconds) of the last queued warning, or None"""
+        if self._last_warning_ns == _NEVER_NS:
+            return None
+        return self._last_warning_ns / 1_000_000_000
+    
+    def _load_pcm(self):
+        """Decode each habit sound into a (data, samplerate) PCM buffer"""
+        try:
+            import sounddevice
+            import soundfile
+        except (ImportError, OSError) as e:
+            self.logger.warning(f"PCM playback unavailable, using default backend: {e}")
+            return {}
+        
+        pcm = {}
+        for habit_type, path in _SOUND_MAP.items():
+            try:
+                pcm[habit_type] = soundfile.read(path, dtype="float32")
+            except Exception as e:
+                self.logger.warning(f"Could not decode sound {path}: {e}")
+        
+        if pcm:
+            self._sd = sounddevice
+        return pcm
+    
+    def _load_players(self):
+        """Preload an AVAudioPlayer per habit sound, keyed by habit type"""
+        players = {}
+        if AVAudioPlayer is None:
+            return players
+        
+        for habit_type, path in _SOUND_MAP.items():
+            player, error = AVAudioPlayer.alloc().initWithContentsOfURL_error_(
+                NSURL.fileURLWithPath_(path), None
+            )
+            if player is None:
+                self.logger.warning(f"Could not preload sound {path}: {error}")
+                continue
+            player.prepareToPlay()
+            players[habit_type] = player
+        
+        return players
+    
+    def play_warning(self, habit_type, now_ns=None):
+        """Queue an audio warning for detected habit (returns immediately)
+        
+        now_ns is an optional time.monotonic_ns() reading the caller already has.
+        """
+        if not self.enabled:
+            return
+        
+        # Lock-free cooldown check: attribute reads/writes are atomic under the
+        # GIL, and a rare race between callers costs at most one extra warning
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        if now_ns - self._last_warning_ns < self._cooldown_ns:
+            return
+        
+        try:
+            self._q.put_nowait(habit_type)
+        except queue.Full:
+            # A warning is already pending; drop this one
+            return
+        self._last_warning_ns = now_ns
     
-    def play_warning(self, habit_type):
-        """Play an audio warning for detected habit"""
-        with self.warning_lock:
-            current_time = time.time()
-            
-            # Check cooldown period
-            if current_time - self.last_warning_time < self.cooldown_seconds:
-                return
-            
-            # Play the warning sound
+    def _audio_loop(self):
+        """Play queued warnings on the background worker thread"""
+        while True:
+            habit_type = self._q.get()
             try:
                 self._play_macos_sound(habit_type)
-                self.last_warning_time = current_time
                 self.logger.info(f"Audio warning played for {habit_type}")
             except Exception as e:
                 self.logger.error(f"Failed to play audio warning: {e}")
-                # Fallback to terminal bell
-                print("\a")
+                # Fallback to terminal bell (no newline, keeps the dashboard intact)
+                sys.stdout.write("\a")
+                sys.stdout.flush()
     
     def _play_macos_sound(self, habit_type):
         """Play sound on macOS using custom MP3 files or system sounds as fallback"""
-        # Different custom sounds for different habits with absolute paths
-        sound_map = {
-            "about-to-chomp": os.path.join(self.project_root, "audio", "about-to-chomp.mp3"),
-            "chomping": os.path.join(self.project_root, "audio", "chomping.mp3"),
-            "pondering": os.path.join(self.project_root, "audio", "pondering.mp3"),
-            "default": "/System/Library/Sounds/Ping.aiff"
-        }
-        
-        sound_file = sound_map.get(habit_type, sound_map["default"])
-        os.system(f"afplay '{sound_file}'")
+        self.logger.debug("Playing sound for %s", habit_type)
+        # Unknown habits use the default sound; a known habit whose sound failed
+        # to load falls through to the next backend rather than playing Ping
+        key = habit_type if habit_type in _SOUND_MAP else "default"
+        buffer = self._pcm.get(key)
+        if buffer is not None:
+            data, samplerate = buffer
+            self._sd.play(data, samplerate, blocking=False)
+            return
+        
+        player = self._players.get(key)
+        if player is not None:
+            # Restart from the beginning if the previous warning is still playing
+            player.setCurrentTime_(0)
+            player.play()
+            return
+        
+        if self._player_cmd is None:
+            # No player available; fall back to the terminal bell
+            sys.stdout.write("\a")
+            sys.stdout.flush()
+            return
+        
+        sound_file = _SOUND_MAP[key]
+        # Fire and forget: no wait(), playback continues in the background
+        subprocess.Popen(
+            [self._player_cmd, sound_file],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True
+        )
     
     def test_audio(self):
         """Test audio functionality"""
+        if not self.enabled:
+            self.logger.info("Audio warnings disabled, skipping audio test")
+            return True
+        
         self.logger.info("Testing audio system...")
         
         # Temporarily disable cooldown for testing
@@ -68,4 +220,4 @@ class AudioManager:
             self.logger.error(f"Audio test failed: {e}")
             return False
         finally:
-            self.cooldown_seconds = original_cooldown
\ No newline at end of file
+            self.cooldown_seconds = original_cooldown
@@ -2,11 +2,99 @@
 Display manager for CLI interface and dashboard
 """
 
+import re
+import shutil
+import sys
+import unicodedata
 import time
 import threading
 import logging
-from colorama import Fore
-from .utils import clear_screen, print_header 
+from functools import lru_cache
+from colorama import Fore, Style
+from .utils import format_header, ensure_colorama
+
+# User-friendly display names for habit classes
+_HABIT_NAMES = {
+    "about-to-chomp": "About to Chomp 👕",
+    "chomping": "Chomping 🤏",
+    "eating": "Eating 💅",
+    "pondering": "Pondering 💅",
+    "unknown": "Unknown Habit",
+    "none": "None"
+}
+
+# Color codes bound once; lines below are built by concatenation at import
+_RED, _GREEN, _YELLOW, _MAGENTA, _CYAN = Fore.RED, Fore.GREEN, Fore.YELLOW, Fore.MAGENTA, Fore.CYAN
+
+# Dashboard line templates, filled from the formatted stats dict. Colored lines
+# reset explicitly since the frame is written in one call (colorama's autoreset
+# only fires once per write)
+_RST = Style.RESET_ALL + "\n"
+_CLEAR_SCREEN = "\x1b[H\x1b[2J"
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+_LINE_SESSION = _GREEN + "Session Duration: {session_duration}" + _RST
+_LINE_HABIT_DETECTED = _RED + "🚨 HABIT DETECTED: {habit_name}" + _RST
+_LINE_CURRENT_SESSION = _RED + "Current Session: {current_habit_duration}" + _RST
+_LINE_CONFIDENCE = _RED + "Confidence: {confidence:.1%}" + _RST
+_LINE_NO_HABIT = _GREEN + "✅ No Bad Habits Detected" + _RST
+_LINE_LAST_CONFIDENCE = _GREEN + "Last Confidence: {confidence:.1%}" + _RST
+_LINE_STATS_HEADER = _YELLOW + "Statistics:" + _RST
+_LINE_TOTAL_DETECTIONS = "  Total Detections: {total_detections}\n"
+_LINE_TOTAL_HABIT_TIME = "  Total Habit Time: {total_habit_time}\n"
+_LINE_SESSIONS_COUNT = "  Number of Sessions: {habit_sessions_count}\n"
+_LINE_DETECTION_RATE = "  Detection Rate: {detection_rate}\n"
+_LINE_AVERAGE_SESSION = "  Average Session: {average_session_duration}\n"
+_LINE_HABIT_PERCENTAGE = "  Habit Percentage: {habit_percentage}\n"
+_LINE_CONTROLS = _MAGENTA + "Press Ctrl+C to stop monitoring" + _RST
+_LINE_FOOTER = _CYAN + "=" * 60 + _RST
+_SHUTDOWN_HEADER = "\n" + _YELLOW + "Stopping habit monitoring..." + _RST
+_SUMMARY = (
+    "\n" + _GREEN + "Session Summary:" + _RST +
+    "  Total Duration: {session_duration}\n" +
+    "  Total Habit Time: {total_habit_time}\n" +
+    "  Total Detections: {total_detections}\n" +
+    "  Number of Sessions: {habit_sessions_count}\n" +
+    _LINE_DETECTION_RATE
+)
+_SUMMARY_WITH_SESSIONS = _SUMMARY + _LINE_AVERAGE_SESSION + _LINE_HABIT_PERCENTAGE
+_HEADER = format_header("HABIT MONITOR - REAL-TIME STATUS")
+_FRAME_START = {True: _HEADER + "\n", False: ""}
+_FRAME_END = {True: _LINE_CONTROLS + _LINE_FOOTER, False: _LINE_CONTROLS}
+
+
+def _visible_width(line):
+    """Terminal columns taken by line, ignoring ANSI codes (wide characters count as 2)"""
+    text = _ANSI_ESCAPE.sub("", line)
+    if text.isascii():
+        return len(text)
+    return sum(2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in text)
+
+
+class _SafeFmt(dict):
+    """Template values; a missing stat renders as a dash instead of raising"""
+    
+    def __missing__(self, key):
+        return "—"
+
+
+@lru_cache(maxsize=None)
+def _stats_template(habit_active, show_confidence, has_sessions):
+    """Whole stats section template for one dashboard layout (8 in total)"""
+    if habit_active:
+        status = _LINE_HABIT_DETECTED + _LINE_CURRENT_SESSION
+        if show_confidence:
+            status += _LINE_CONFIDENCE
+    else:
+        status = _LINE_NO_HABIT
+        if show_confidence:
+            status += _LINE_LAST_CONFIDENCE
+    
+    stats = (_LINE_STATS_HEADER + _LINE_TOTAL_DETECTIONS + _LINE_TOTAL_HABIT_TIME +
+             _LINE_SESSIONS_COUNT + _LINE_DETECTION_RATE)
+    if has_sessions:
+        stats += _LINE_AVERAGE_SESSION + _LINE_HABIT_PERCENTAGE
+    
+    return _LINE_SESSION + "\n" + status + "\n" + stats + "\n"
 
 
 class DisplayManager:
@@ -20,10 +108,21 @@ class DisplayManager:
         self.stats_tracker = None
         self.logger = logging.getLogger(__name__)
         
-        # Display state
+        # Display state, written only by the prediction consumer thread and read
+        # without a lock by the display thread
         self.last_detection_class = None
         self.last_confidence = 0.0
         
+        # Inputs and rows of the last rendered frame, used to skip identical
+        # redraws and to repaint only the rows that changed
+        self._last_render_key = None
+        self._last_rows = None
+        
+        # Signalled when the displayed habit changes so the dashboard redraws
+        # immediately instead of at the next refresh tick
+        self._cond = threading.Condition()
+        self._dirty = False
+        
     def set_stats_tracker(self, stats_tracker):
         """Set the statistics tracker for display"""
         self.stats_tracker = stats_tracker
@@ -33,6 +132,7 @@ class DisplayManager:
         if self.running:
             return
         
+        ensure_colorama()
         self.running = True
         self.display_thread = threading.Thread(target=self._display_loop)
         self.display_thread.daemon = True
@@ -42,109 +142,122 @@ class DisplayManager:
     
     def stop_display(self):
         """Stop the display update thread"""
-        self.running = False
+        with self._cond:
+            self.running = False
+            self._cond.notify()
         if self.display_thread:
             self.display_thread.join(timeout=2)
         
         self.logger.info("Display manager stopped")
     
     def update_detection_info(self, detection_class, confidence):
-        """Update the current detection information"""
+        """Update the current detection information (prediction consumer thread only)"""
+        changed = detection_class != self.last_detection_class
         self.last_detection_class = detection_class
         self.last_confidence = confidence
+        
+        # Confidence jitters every frame; it is picked up at the next tick
+        if changed:
+            with self._cond:
+                self._dirty = True
+                self._cond.notify()
     
     def _display_loop(self):
         """Main display update loop"""
         while self.running:
             try:
                 self._render_dashboard()
-                time.sleep(self.refresh_rate)
+                with self._cond:
+                    # Periodic wake keeps the session clock ticking;
+                    # unchanged frames are skipped by the render key
+                    self._cond.wait_for(
+                        lambda: self._dirty or not self.running,
+                        timeout=self.refresh_rate
+                    )
+                    self._dirty = False
             except Exception as e:
                 self.logger.error(f"Display error: {e}")
                 time.sleep(1)
     
     def _render_dashboard(self):
-        """Render the main dashboard"""
-        # Clear screen
-        clear_screen()
+        """Render the main dashboard (skipped when nothing visible changed)"""
+        stats = self.stats_tracker.get_formatted_stats() if self.stats_tracker else None
         
-        # Header
-        if self.show_header:
-            print_header("HABIT MONITOR - REAL-TIME STATUS")
-            print()
+        key = (
+            tuple(stats.values()) if stats else None,
+            self.last_detection_class,
+            round(self.last_confidence, 3)
+        )
+        if key == self._last_render_key:
+            return
+        self._last_render_key = key
         
-        # Get current statistics
-        if self.stats_tracker:
-            stats = self.stats_tracker.get_formatted_stats()
-            
-            # Session information
-            print(f"{Fore.GREEN}Session Duration: {stats['session_duration']}")
-            print()
-            
-            # Current habit status
-            if stats['is_habit_active']:
-                habit_name = self._get_habit_display_name(self.last_detection_class)
-                print(f"{Fore.RED}🚨 HABIT DETECTED: {habit_name}")
-                print(f"{Fore.RED}Current Session: {stats['current_habit_duration']}")
-                if self.last_confidence > 0:
-                    print(f"{Fore.RED}Confidence: {self.last_confidence:.1%}")
-            else:
-                print(f"{Fore.GREEN}✅ No Bad Habits Detected")
-                if self.last_confidence > 0:
-                    print(f"{Fore.GREEN}Last Confidence: {self.last_confidence:.1%}")
-            
-            print()
-            
-            # Statistics section
-            print(f"{Fore.YELLOW}Statistics:")
-            print(f"  Total Detections: {stats['total_detections']}")
-            print(f"  Total Habit Time: {stats['total_habit_time']}")
-            print(f"  Number of Sessions: {stats['habit_sessions_count']}")
-            print(f"  Detection Rate: {stats['detection_rate']}")
-            
-            if stats['habit_sessions_count'] > 0:
-                print(f"  Average Session: {stats['average_session_duration']}")
-                print(f"  Habit Percentage: {stats['habit_percentage']}")
-            
-            print()
+        # Fill the precomposed template for the current layout and emit the
+        # frame (or just its changed rows) in a single write
+        body = ""
+        if stats:
+            template = _stats_template(
+                stats['is_habit_active'],
+                self.last_confidence > 0,
+                stats['habit_sessions_count'] > 0
+            )
+            body = template.format_map(_SafeFmt(
+                stats,
+                habit_name=self._get_habit_display_name(self.last_detection_class),
+                confidence=self.last_confidence
+            ))
         
-        # Control information
-        print(f"{Fore.MAGENTA}Press Ctrl+C to stop monitoring")
+        frame = _FRAME_START[bool(self.show_header)] + body + _FRAME_END[bool(self.show_header)]
+        sys.stdout.write(self._diff_frame(frame))
+        sys.stdout.flush()
+    
+    def _diff_frame(self, frame):
+        """Return the output needed to turn the previous frame into this one"""
+        rows = frame.split("\n")
+        previous = self._last_rows
+        self._last_rows = rows
+        
+        # Layout changed (or first frame): clear and redraw everything. Also
+        # redraw when the frame does not fit the terminal: once it scrolls or
+        # a row wraps, absolute row addressing no longer lines up
+        if previous is None or len(previous) != len(rows) or not self._fits_terminal(rows):
+            return _CLEAR_SCREEN + frame
         
-        # Footer
-        if self.show_header:
-            print(f"{Fore.CYAN}{'='*60}")
+        # Same layout: rewrite changed rows in place (ANSI rows are 1-based),
+        # then park the cursor below the frame
+        updates = [
+            f"\x1b[{row};1H{line}\x1b[K"
+            for row, (line, old) in enumerate(zip(rows, previous), 1)
+            if line != old
+        ]
+        updates.append(f"\x1b[{len(rows)};1H")
+        return "".join(updates)
+    
+    @staticmethod
+    def _fits_terminal(rows):
+        """True if every row fits on one terminal line and the frame fits the screen"""
+        size = shutil.get_terminal_size()
+        if len(rows) > size.lines:
+            return False
+        return all(_visible_width(line) <= size.columns for line in rows)
     
     def _get_habit_display_name(self, habit_class):
         """Get a user-friendly display name for a habit class"""
-        habit_names = {
-            "about-to-chomp": "About to Chomp 👕",
-            "chomping": "Chomping 🤏",
-            "eating": "Eating 💅",
-            "pondering": "Pondering 💅",
-            "unknown": "Unknown Habit",
-            "none": "None"
-        }
-        
-        return habit_names.get(habit_class, f"Habit: {habit_class}")
+        return _HABIT_NAMES.get(habit_class, f"Habit: {habit_class}")
     
     def show_shutdown_message(self, stats_tracker=None):
         """Show shutdown message with session summary"""
-        print(f"\n{Fore.YELLOW}Stopping habit monitoring...")
+        ensure_colorama()
         
+        # One write so the summary cannot interleave with teardown output
+        message = _SHUTDOWN_HEADER
         if stats_tracker:
             stats = stats_tracker.get_formatted_stats()
-            
-            print(f"\n{Fore.GREEN}Session Summary:")
-            print(f"  Total Duration: {stats['session_duration']}")
-            print(f"  Total Habit Time: {stats['total_habit_time']}")
-            print(f"  Total Detections: {stats['total_detections']}")
-            print(f"  Number of Sessions: {stats['habit_sessions_count']}")
-            print(f"  Detection Rate: {stats['detection_rate']}")
-            
-            if stats['habit_sessions_count'] > 0:
-                print(f"  Average Session: {stats['average_session_duration']}")
-                print(f"  Habit Percentage: {stats['habit_percentage']}")
+            template = _SUMMARY_WITH_SESSIONS if stats['habit_sessions_count'] > 0 else _SUMMARY
+            message += template.format_map(_SafeFmt(stats))
+        
+        sys.stdout.write(message)
+        sys.stdout.flush()
     
     def __enter__(self):
         """Context manager entry"""
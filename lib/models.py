@@ -1,5 +1,8 @@
 """
 Simple utility functions for safely accessing workflow response values
+
+Missing keys fall back to defaults; a result that is not a dict raises, and
+callers (HabitMonitor._process_prediction) handle that once at the boundary.
 """
 
 from typing import Dict, Any, Tuple
@@ -7,6 +10,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_CHOMPING = 'chomping'
+
 
 def is_chomping_detected(workflow_result: Dict[str, Any], confidence_threshold: float = 0.5) -> Tuple[bool, float]:
     """
@@ -19,28 +24,23 @@ def is_chomping_detected(workflow_result: Dict[str, Any], confidence_threshold:
     Returns:
         Tuple of (is_chomping_detected, confidence_score)
     """
-    try:
-        # Check if we have classification predictions
-        classification_predictions = workflow_result.get('classification_predictions', {})
-        if not classification_predictions:
-            logger.debug("No classification_predictions found in workflow result")
-            return False, 0.0
-        
-        # Get the top class and confidence
-        top_class = classification_predictions.get('top', '')
-        confidence = classification_predictions.get('confidence', 0.0)
-        
-        # Check if it's chomping and above threshold
-        is_chomping = top_class == 'chomping'
-        above_threshold = confidence >= confidence_threshold
-        
-        logger.debug(f"Top class: {top_class}, Confidence: {confidence}, Threshold: {confidence_threshold}")
-        
-        return is_chomping and above_threshold, confidence
-        
-    except Exception as e:
-        logger.error(f"Error checking chomping detection: {e}")
+    # Check if we have classification predictions
+    classification_predictions = workflow_result.get('classification_predictions') or {}
+    if not classification_predictions:
+        logger.debug("No classification_predictions found in workflow result")
         return False, 0.0
+    
+    # Get the top class and confidence
+    top_class = classification_predictions.get('top', '')
+    confidence = classification_predictions.get('confidence', 0.0)
+    
+    logger.debug("Top class: %s, Confidence: %s, Threshold: %s", top_class, confidence, confidence_threshold)
+    
+    # Most frames are not chomping; skip the threshold compare for them
+    if top_class != _CHOMPING:
+        return False, confidence
+    
+    return confidence >= confidence_threshold, confidence
 
 
 def get_top_class(workflow_result: Dict[str, Any]) -> str:
@@ -53,15 +53,39 @@ def get_top_class(workflow_result: Dict[str, Any]) -> str:
     Returns:
         Top classification class or empty string if not found
     """
-    try:
-        # Try top_class first (if available at root level)
-        if 'top_class' in workflow_result:
-            return workflow_result['top_class']
-        
-        # Fall back to classification_predictions.top
-        classification_predictions = workflow_result.get('classification_predictions', {})
-        return classification_predictions.get('top', '')
+    # Try top_class first (if available at root level)
+    if 'top_class' in workflow_result:
+        return workflow_result['top_class']
+    
+    # Fall back to classification_predictions.top
+    classification_predictions = workflow_result.get('classification_predictions') or {}
+    return classification_predictions.get('top', '')
+
+
+def extract_prediction(workflow_result: Dict[str, Any], confidence_threshold: float = 0.5) -> Tuple[bool, str, float]:
+    """
+    Extract the chomping flag, top class and confidence in a single pass
+    
+    Equivalent to calling is_chomping_detected and get_top_class, but reads
+    classification_predictions only once. Malformed results raise; callers
+    handle errors at the boundary.
+    
+    Args:
+        workflow_result: Raw workflow response dictionary
+        confidence_threshold: Minimum confidence threshold (default 0.5)
         
-    except Exception as e:
-        logger.error(f"Error getting top class: {e}")
-        return ''
+    Returns:
+        Tuple of (is_chomping_detected, top_class, confidence_score)
+    """
+    classification_predictions = workflow_result.get('classification_predictions') or {}
+    top = classification_predictions.get('top', '')
+    confidence = classification_predictions.get('confidence', 0.0)
+    
+    # Root-level top_class wins for display, as in get_top_class
+    top_class = workflow_result.get('top_class', top)
+    
+    # Most frames are not chomping; skip the threshold compare for them
+    if top != _CHOMPING:
+        return False, top_class, confidence
+    
+    return confidence >= confidence_threshold, top_class, confidence
@@ -3,26 +3,56 @@ Simplified habit monitor using Roboflow's InferencePipeline
 """
 
 import time
+import logging
+import queue
 import signal
 import sys
 import pprint
 import os
+import threading
 from datetime import datetime
-from inference import InferencePipeline
 from .audio import AudioManager
 from .display import DisplayManager
 from .stats import StatsTracker
 from .utils import setup_logging, validate_confidence
-from .models import is_chomping_detected, get_top_class 
+from .models import extract_prediction
+
+# (habit_detected, top_class, confidence) for results that could not be parsed
+_UNKNOWN = (False, 'unknown', 0.0)
+
+# Roboflow REST API bases, used to check workflow access without a pipeline
+_ROBOFLOW_API_URL = "https://api.roboflow.com"
+_ROBOFLOW_STAGING_API_URL = "https://api.roboflow.one"
+
+
+def _roboflow_api_url():
+    """Roboflow REST API base URL, resolved the way the inference package does"""
+    # API_BASE_URL wins (self-hosted/staging setups); otherwise PROJECT picks
+    # the public platform or staging, as in inference.core.env
+    if os.getenv("PROJECT", "roboflow-platform") == "roboflow-platform":
+        default = _ROBOFLOW_API_URL
+    else:
+        default = _ROBOFLOW_STAGING_API_URL
+    return os.getenv("API_BASE_URL", default).rstrip("/")
 
 
 class HabitMonitor:
     """Simplified habit monitoring using Roboflow InferencePipeline"""
     
-    def __init__(self, workspace_name, workflow_id, confidence_threshold=0.7, config=None):
+    __slots__ = (
+        "session_start_time", "_session_start_iso", "confidence_threshold",
+        "workspace_name", "workflow_id", "config", "camera_index", "logger",
+        "log_file", "api_key", "audio_manager", "display_manager", "stats_tracker",
+        "pipeline", "is_monitoring", "last_detection_time", "_pred_q",
+        "_pred_q_max", "_consumer", "_prev_handlers", "_start_monotonic_ns",
+        "__weakref__"
+    )
+    
+    def __init__(self, workspace_name, workflow_id, confidence_threshold=0.7, config=None, camera_index=None):
         
         # Store session start time for consistent timestamps
         self.session_start_time = datetime.now()
+        self._session_start_iso = self.session_start_time.isoformat()
         
         # Validate parameters
         self.confidence_threshold = validate_confidence(confidence_threshold)
@@ -32,6 +62,11 @@ class HabitMonitor:
         # Configuration
         self.config = config or {}
         
+        # Camera to open; an explicit argument wins over CAMERA_INDEX
+        if camera_index is None:
+            camera_index = self.config.get("CAMERA_INDEX", 0)
+        self.camera_index = camera_index
+        
         # Setup logging with timestamped files
         log_level = self.config.get("LOG_LEVEL", "INFO")
         self.logger, self.log_file = setup_logging(log_level, self.session_start_time)
@@ -43,7 +78,9 @@ class HabitMonitor:
         
         # Initialize components
         self.audio_manager = AudioManager(
-            cooldown_seconds=self.config.get("AUDIO_WARNING_COOLDOWN", 5)
+            cooldown_seconds=self.config.get("AUDIO_WARNING_COOLDOWN", 5),
+            use_pcm=self.config.get("AUDIO_PCM_PLAYBACK", False),
+            enabled=self.config.get("AUDIO_ENABLED", True)
         )
         
         # Display manager for CLI dashboard
@@ -57,11 +94,17 @@ class HabitMonitor:
         # Pipeline and monitoring state
         self.pipeline = None
         self.is_monitoring = False
-        self.last_detection_time = None
+        self.last_detection_time = None  # time.monotonic_ns() of last detection
+        self._start_monotonic_ns = None
+        
+        # Predictions are handed off from the pipeline thread to a consumer
+        # thread; keep only the newest couple so slow sinks drop stale frames
+        self._pred_q = queue.SimpleQueue()
+        self._pred_q_max = 2
+        self._consumer = None
         
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Signal handlers replaced while monitoring, restored on stop
+        self._prev_handlers = {}
         
         self.logger.info("HabitMonitor initialized with InferencePipeline")
         self.logger.info(f"Session started at: {self.session_start_time}")
@@ -85,23 +128,46 @@ class HabitMonitor:
         except Exception as e:
             results["Audio System"] = {"success": False, "message": f"Audio test failed: {e}"}
         
-        # Check camera (we'll try to initialize the pipeline briefly)
+        # Check workflow access and camera separately, without building a pipeline
+        results["Roboflow Workflow"] = self._check_workflow()
+        results["Camera"] = self._check_camera()
+        
+        return results
+    
+    def _check_workflow(self):
+        """Check that the API key can read the configured workflow"""
         try:
-            test_pipeline = InferencePipeline.init_with_workflow(
-                api_key=self.api_key,
-                workspace_name=self.workspace_name,
-                workflow_id=self.workflow_id,
-                video_reference=0,
-                on_prediction=lambda x, y: None,  # Dummy callback
-                image_input_name="frame"  # Map video frames to the 'frame' parameter
-            )
-            results["Camera & Workflow"] = {"success": True, "message": "Camera and workflow accessible"}
-            # Don't start the test pipeline, just creating it validates access
-            del test_pipeline
+            import requests
+            
+            url = f"{_roboflow_api_url()}/{self.workspace_name}/workflows/{self.workflow_id}"
+            response = requests.get(url, params={"api_key": self.api_key}, timeout=10)
         except Exception as e:
-            results["Camera & Workflow"] = {"success": False, "message": f"Camera/workflow test failed: {e}"}
+            return {"success": False, "message": f"Workflow check failed: {e}"}
         
-        return results
+        if response.status_code == 200:
+            return {"success": True, "message": "Workflow accessible"}
+        if response.status_code in (401, 403):
+            return {"success": False, "message": "API key rejected by Roboflow"}
+        if response.status_code == 404:
+            return {"success": False, "message": f"Workflow {self.workspace_name}/{self.workflow_id} not found"}
+        return {"success": False, "message": f"Unexpected response from Roboflow: HTTP {response.status_code}"}
+    
+    def _check_camera(self):
+        """Check that the configured camera can be opened"""
+        try:
+            import cv2
+            
+            capture = cv2.VideoCapture(self.camera_index)
+            try:
+                opened = capture.isOpened()
+            finally:
+                capture.release()
+        except Exception as e:
+            return {"success": False, "message": f"Camera test failed: {e}"}
+        
+        if opened:
+            return {"success": True, "message": f"Camera {self.camera_index} accessible"}
+        return {"success": False, "message": f"Camera {self.camera_index} could not be opened"}
     
     def start_monitoring(self):
         """Start the habit monitoring pipeline"""
@@ -112,13 +178,16 @@ class HabitMonitor:
         try:
             self.logger.info("Starting habit monitoring...")
             
+            # Deferred: the inference package pulls in torch/OpenCV/onnxruntime
+            from inference import InferencePipeline
+            
             # Initialize the InferencePipeline
             self.pipeline = InferencePipeline.init_with_workflow(
                 api_key=self.api_key,
 
                 max_fps=self.config.get("CAMERA_FPS", 15),
                 on_prediction=self._on_prediction,
-                video_reference=0,
+                video_reference=self.camera_index,
                 workflow_id=self.workflow_id,
                 workspace_name=self.workspace_name,
                 image_input_name="frame"  # Map video frames to the 'frame' parameter
@@ -126,13 +195,17 @@ class HabitMonitor:
             
             # Start statistics tracking
             self.stats_tracker.start_session()
+            self._start_monotonic_ns = time.monotonic_ns()
             
             # Set stats tracker and start display (if enabled)
             self.display_manager.set_stats_tracker(self.stats_tracker)
             self.display_manager.start_display()
             
-            # Start the pipeline
+            # Start the prediction consumer, then the pipeline
             self.is_monitoring = True
+            self._install_signal_handlers()
+            self._consumer = threading.Thread(target=self._consume_predictions, daemon=True)
+            self._consumer.start()
             self.logger.info("Habit monitoring started successfully")
             
             # Start pipeline and wait
@@ -148,63 +221,78 @@ class HabitMonitor:
             self.stop_monitoring()
     
     def _on_prediction(self, result, _video_frame):
-        """Handle predictions from the InferencePipeline"""
-        try:
-            # Extract prediction details and determine if habit was detected
-            habit_detected, prediction_data = self._process_prediction(result)
-            
-            # Update display with latest detection info
-            self.display_manager.update_detection_info(
-                prediction_data['top_class'], 
-                prediction_data['confidence']
-            )
-            
-            # Always update stats (detected or not)
-            self.stats_tracker.update_habit_detection(
-                detected=habit_detected,
-                habit_class=prediction_data['top_class']
-            )
+        """Queue a prediction from the InferencePipeline and return immediately"""
+        # Frames arriving during shutdown must not displace the stop sentinel
+        if not self.is_monitoring:
+            return
+        # One clock read per frame, shared by stats and the audio cooldown
+        self._put_latest((result, time.monotonic_ns()))
+    
+    def _put_latest(self, item):
+        """Put item on the prediction queue, discarding the oldest entries beyond the bound"""
+        # SimpleQueue is unbounded, so the bound is enforced here
+        q = self._pred_q
+        while q.qsize() >= self._pred_q_max:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                break
+        q.put(item)
+    
+    def _consume_predictions(self):
+        """Consumer thread: update display and stats, warn on detection"""
+        # Bind the per-frame collaborators once for the life of the thread
+        get = self._pred_q.get
+        process = self._process_prediction
+        update_info = self.display_manager.update_detection_info
+        update_stats = self.stats_tracker.update_habit_detection
+        play_warning = self.audio_manager.play_warning
+        log = self.logger
+        
+        while True:
+            item = get()
+            if item is None:
+                return
+            result, timestamp = item
             
-            if habit_detected:
-                current_time = time.time()
+            try:
+                # Extract prediction details and determine if habit was detected
+                habit_detected, top_class, confidence = process(result)
                 
-                # Play audio warning (respects cooldown)
-                self.audio_manager.play_warning(prediction_data['top_class'])
+                # Update display with latest detection info
+                update_info(top_class, confidence)
                 
-                # Log the detection
-                self.logger.info(f"Chomping detected: {prediction_data['top_class']} with confidence {prediction_data['confidence']:.3f}")
+                # Always update stats (detected or not)
+                update_stats(detected=habit_detected, habit_class=top_class, now=timestamp / 1e9)
                 
-                self.last_detection_time = current_time
-        
-        except Exception as e:
-            self.logger.error(f"Error processing prediction: {e}")
+                if habit_detected:
+                    # Play audio warning (respects cooldown)
+                    play_warning(top_class, now_ns=timestamp)
+                    
+                    # Log the detection
+                    log.info("Chomping detected: %s with confidence %.3f", top_class, confidence)
+                    
+                    self.last_detection_time = timestamp
+            
+            except Exception as e:
+                log.error("Error processing prediction: %s", e)
     
     def _process_prediction(self, result):
-        """Process prediction result to determine if a habit was detected and extract data"""
+        """Process prediction result into (habit_detected, top_class, confidence)"""
+        # Assume the expected shape; only malformed results pay for the fallback
         try:
-            # Use simple utility functions to extract what we need
-            habit_detected, confidence = is_chomping_detected(result, self.confidence_threshold)
-            top_class = get_top_class(result)
-            
-            # Extract prediction data
-            prediction_data = {
-                'top_class': top_class,
-                'confidence': confidence
-            }
-            
-            # Log the detection result
-            if habit_detected:
-                self.logger.debug(f"Chomping detected: {top_class} with confidence {confidence:.3f}")
-            else:
-                self.logger.debug(f"No chomping: {top_class} with confidence {confidence:.3f}")
-            
-            return habit_detected, prediction_data
-            
-        except Exception as e:
-            self.logger.error(f"Error processing prediction result: {e}")
-            self.logger.error(f"Raw result: {pprint.pformat(result)}")
+            habit_detected, top_class, confidence = extract_prediction(result, self.confidence_threshold)
+        except (KeyError, TypeError, AttributeError) as e:
+            self.logger.error("Error processing prediction result: %s", e)
+            self.logger.error("Raw result: %s", pprint.pformat(result))
             # Don't terminate the application, just return no detection
-            return False, {'top_class': 'unknown', 'confidence': 0.0}
+            return _UNKNOWN
+        
+        # Detections are logged at INFO by the consumer; only misses here
+        if not habit_detected and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("No chomping: %s with confidence %.3f", top_class, confidence)
+        
+        return habit_detected, top_class, confidence
     
     def stop_monitoring(self):
         """Stop the monitoring pipeline"""
@@ -213,6 +301,7 @@ class HabitMonitor:
         
         self.logger.info("Stopping habit monitoring...")
         self.is_monitoring = False
+        self._restore_signal_handlers()
         
         # Stop pipeline
         if self.pipeline:
@@ -221,21 +310,52 @@ class HabitMonitor:
             except Exception as e:
                 self.logger.error(f"Error stopping pipeline: {e}")
         
+        # Let the consumer finish queued predictions before stats are closed
+        consumer_stopped = True
+        if self._consumer:
+            self._pred_q.put(None)
+            self._consumer.join(timeout=2)
+            consumer_stopped = not self._consumer.is_alive()
+            self._consumer = None
+        
         # Stop display (if enabled)
         self.display_manager.stop_display()
         
         # End session and save stats
         if self.stats_tracker:
-            self.stats_tracker.end_session()
+            # The consumer is the tracker's only writer; never end the session
+            # while it might still be updating it
+            if consumer_stopped:
+                self.stats_tracker.end_session()
+            else:
+                self.logger.warning("Prediction consumer did not stop in time; leaving statistics session open")
             
             # Show final summary (if display enabled)
             self.display_manager.show_shutdown_message(self.stats_tracker)
         
-        session_duration = datetime.now() - self.session_start_time
-        self.logger.info(f"Session ended. Duration: {session_duration}")
+        duration_s = (time.monotonic_ns() - self._start_monotonic_ns) / 1e9
+        self.logger.info("Session ended. Duration: %.2fs", duration_s)
         self.logger.info(f"Log file saved: {self.log_file}")
         self.logger.info("Monitoring stopped")
     
+    def _install_signal_handlers(self):
+        """Route SIGINT/SIGTERM to _signal_handler, remembering the previous handlers"""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._prev_handlers[signum] = signal.signal(signum, self._signal_handler)
+            except ValueError:
+                # Not on the main thread; leave signal handling to the host application
+                self.logger.debug("Not installing handler for signal %s outside the main thread", signum)
+    
+    def _restore_signal_handlers(self):
+        """Put back the signal handlers that were active before monitoring started"""
+        while self._prev_handlers:
+            signum, handler = self._prev_handlers.popitem()
+            try:
+                signal.signal(signum, handler)
+            except ValueError:
+                self.logger.debug("Could not restore handler for signal %s outside the main thread", signum)
+    
     def _signal_handler(self, signum, _frame):
         """Handle interrupt signals"""
         self.logger.info(f"Received signal {signum}, stopping monitoring...")
@@ -248,10 +368,12 @@ class HabitMonitor:
             "workspace_name": self.workspace_name,
             "workflow_id": self.workflow_id,
             "confidence_threshold": self.confidence_threshold,
+            "camera_index": self.camera_index,
+            "audio_enabled": self.audio_manager.enabled if self.audio_manager else False,
             "audio_cooldown": self.audio_manager.cooldown_seconds if self.audio_manager else 0,
             "display_refresh_rate": self.display_manager.refresh_rate if self.display_manager else 0,
             "log_file": self.log_file,
-            "session_start": self.session_start_time.isoformat()
+            "session_start": self._session_start_iso
         }
     
     def __enter__(self):
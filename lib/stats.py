@@ -3,30 +3,57 @@ Statistics tracker for habit monitoring analytics
 """
 
 import logging
+import sys
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from .utils import format_duration, safe_divide
+from .utils import format_duration
+
+# Most recent habit sessions kept in memory; totals cover the whole session
+_SESSION_HISTORY_CAP = 1000
 
 
 class StatsTracker:
-    """Tracks and analyzes habit detection statistics"""
+    """
+    Tracks and analyzes habit detection statistics
+    
+    Single-writer by design: only HabitMonitor's prediction consumer thread
+    calls the update methods (end_session runs once that thread has exited),
+    so counters are plain attributes with no lock. The display thread reads
+    them directly; attribute reads and rebinds are atomic under the GIL, and
+    a frame that mixes values from two consecutive updates is corrected on
+    the next refresh.
+    """
     
-    def __init__(self):
+    def __init__(self, history_cap=_SESSION_HISTORY_CAP):
         self.logger = logging.getLogger(__name__)
         
-        # Session tracking
+        # Session tracking. Timestamps are time.monotonic() floats and
+        # durations are float seconds; session_start_time is wall clock
         self.session_start_time = None
+        self._session_start_mono = None
         self.habit_start_time = None
-        self.total_habit_time = timedelta(0)
-        self.current_habit_duration = timedelta(0)
+        self.habit_class = None
+        self.total_habit_time = 0.0
+        self.current_habit_duration = 0.0
         self.is_habit_active = False
         
         # Statistics
         self.total_detections = 0
-        self.habit_sessions = []
+        self.habit_session_count = 0
+        # (start_time, end_time, duration_seconds, habit_class) of the most
+        # recent sessions; classes are interned so records share one string
+        self.habit_sessions = deque(maxlen=history_cap)
+        
+        # Bumped on every state change; keys the formatted-stats cache. The
+        # cache is one tuple so readers always see a matching (version, dict)
+        self._version = 0
+        self._formatted_cache = (None, None)
     
     def start_session(self):
         """Start a new monitoring session"""
         self.session_start_time = datetime.now()
+        self._session_start_mono = time.monotonic()
         self.logger.info("Statistics session started")
     
     def end_session(self):
@@ -37,9 +64,12 @@ class StatsTracker:
         
         self.logger.info("Statistics session ended")
     
-    def update_habit_detection(self, detected, habit_class="unknown"):
-        """Update habit detection state and statistics"""
-        current_time = datetime.now()
+    def update_habit_detection(self, detected, habit_class="unknown", now=None):
+        """Update habit detection state and statistics
+        
+        now is an optional time.monotonic() reading for the frame, in seconds.
+        """
+        current_time = time.monotonic() if now is None else now
         
         if detected and not self.is_habit_active:
             # Habit session started
@@ -56,108 +86,122 @@ class StatsTracker:
     def _start_habit_session(self, timestamp, habit_class):
         """Start a new habit session"""
         self.habit_start_time = timestamp
+        # Only strings can be interned; other values are stored as given
+        self.habit_class = sys.intern(habit_class) if isinstance(habit_class, str) else habit_class
         self.is_habit_active = True
         self.total_detections += 1
+        self._version += 1
         
         self.logger.info(f"Habit session started: {habit_class}")
     
     def _end_habit_session(self, timestamp=None):
         """End the current habit session"""
-        if not self.is_habit_active or not self.habit_start_time:
+        if not self.is_habit_active or self.habit_start_time is None:
             return
         
-        end_time = timestamp or datetime.now()
+        end_time = time.monotonic() if timestamp is None else timestamp
         session_duration = end_time - self.habit_start_time
         
         # Record the session
-        self.habit_sessions.append({
-            "start_time": self.habit_start_time,
-            "end_time": end_time,
-            "duration": session_duration
-        })
+        self.habit_sessions.append((self.habit_start_time, end_time, session_duration, self.habit_class))
+        self.habit_session_count += 1
         
         # Update totals
         self.total_habit_time += session_duration
         
         # Reset state
         self.is_habit_active = False
-        self.current_habit_duration = timedelta(0)
+        self.current_habit_duration = 0.0
         self.habit_start_time = None
+        self.habit_class = None
+        self._version += 1
         
         self.logger.info(f"Habit session ended: {format_duration(session_duration)}")
     
     def _update_current_habit_duration(self, timestamp):
         """Update the current habit session duration"""
-        if self.habit_start_time:
+        if self.habit_start_time is not None:
             self.current_habit_duration = timestamp - self.habit_start_time
+            self._version += 1
+    
+    def _session_seconds(self, now=None):
+        """Seconds since start_session as of monotonic time now, or 0.0 before it"""
+        if self._session_start_mono is None:
+            return 0.0
+        if now is None:
+            now = time.monotonic()
+        return now - self._session_start_mono
     
-    def get_session_duration(self):
+    def get_session_duration(self, now=None):
         """Get total session duration"""
-        if not self.session_start_time:
-            return timedelta(0)
-        return datetime.now() - self.session_start_time
+        return timedelta(seconds=self._session_seconds(now))
     
-    def get_habit_percentage(self):
+    def get_habit_percentage(self, now=None):
         """Get percentage of time spent on habits"""
-        session_duration = self.get_session_duration()
-        if session_duration.total_seconds() == 0:
+        session_seconds = self._session_seconds(now)
+        if not session_seconds:
             return 0.0
         
-        total_habit_seconds = self.total_habit_time.total_seconds()
-        current_habit_seconds = self.current_habit_duration.total_seconds()
-        
-        return safe_divide(
-            total_habit_seconds + current_habit_seconds,
-            session_duration.total_seconds()
-        ) * 100
+        return (self.total_habit_time + self.current_habit_duration) / session_seconds * 100
     
     def get_average_session_duration(self):
         """Get average habit session duration"""
-        if not self.habit_sessions:
+        if not self.habit_session_count:
             return timedelta(0)
         
-        total_duration = sum(
-            [session["duration"] for session in self.habit_sessions],
-            timedelta(0)
-        )
-        
-        return total_duration / len(self.habit_sessions)
+        # total_habit_time sums every ended session, including ones the
+        # bounded history has already dropped
+        return timedelta(seconds=self.total_habit_time / self.habit_session_count)
     
-    def get_detection_rate(self):
+    def get_detection_rate(self, now=None):
         """Get detection rate (detections per minute)"""
-        session_duration = self.get_session_duration()
-        if session_duration.total_seconds() == 0:
+        session_seconds = self._session_seconds(now)
+        if not session_seconds:
             return 0.0
         
-        minutes = session_duration.total_seconds() / 60
-        return safe_divide(self.total_detections, minutes)
+        return self.total_detections * 60 / session_seconds
     
     def get_current_stats(self):
         """Get current statistics summary"""
+        # One clock read so the time-based figures describe the same instant
+        now = time.monotonic()
         return {
-            "session_duration": self.get_session_duration(),
+            "session_duration": self.get_session_duration(now),
             "total_detections": self.total_detections,
-            "total_habit_time": self.total_habit_time,
-            "current_habit_duration": self.current_habit_duration,
-            "habit_sessions_count": len(self.habit_sessions),
+            "total_habit_time": timedelta(seconds=self.total_habit_time),
+            "current_habit_duration": timedelta(seconds=self.current_habit_duration),
+            "habit_sessions_count": self.habit_session_count,
             "average_session_duration": self.get_average_session_duration(),
-            "habit_percentage": self.get_habit_percentage(),
-            "detection_rate": self.get_detection_rate(),
+            "habit_percentage": self.get_habit_percentage(now),
+            "detection_rate": self.get_detection_rate(now),
             "is_habit_active": self.is_habit_active
         }
     
     def get_formatted_stats(self):
         """Get formatted statistics for display"""
-        stats = self.get_current_stats()
-        
+        # Fields that only change with tracker state are formatted once per
+        # state change; the clock-dependent ones are refreshed on every call
+        version, cached = self._formatted_cache
+        if version != self._version:
+            cached = {
+                "total_detections": self.total_detections,
+                "total_habit_time": format_duration(self.total_habit_time),
+                "current_habit_duration": format_duration(self.current_habit_duration),
+                "habit_sessions_count": self.habit_session_count,
+                "average_session_duration": format_duration(self.get_average_session_duration()),
+                "is_habit_active": self.is_habit_active
+            }
+            self._formatted_cache = (self._version, cached)
+        
+        now = time.monotonic()
         return {
-            "session_duration": format_duration(stats["session_duration"]),
-            "total_detections": stats["total_detections"],
-            "total_habit_time": format_duration(stats["total_habit_time"]),
-            "current_habit_duration": format_duration(stats["current_habit_duration"]),
-            "habit_sessions_count": stats["habit_sessions_count"],
-            "average_session_duration": format_duration(stats["average_session_duration"]),
-            "habit_percentage": f"{stats['habit_percentage']:.1f}%",
-            "detection_rate": f"{stats['detection_rate']:.1f}/min",
-            "is_habit_active": stats["is_habit_active"]
-        }
\ No newline at end of file
+            "session_duration": format_duration(self._session_seconds(now)),
+            "total_detections": cached["total_detections"],
+            "total_habit_time": cached["total_habit_time"],
+            "current_habit_duration": cached["current_habit_duration"],
+            "habit_sessions_count": cached["habit_sessions_count"],
+            "average_session_duration": cached["average_session_duration"],
+            "habit_percentage": f"{self.get_habit_percentage(now):.1f}%",
+            "detection_rate": f"{self.get_detection_rate(now):.1f}/min",
+            "is_habit_active": cached["is_habit_active"]
+        }
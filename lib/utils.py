@@ -2,15 +2,47 @@
 Utility functions for the habit monitor application
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import sys
 from datetime import datetime, timedelta
-from colorama import Fore
+from functools import lru_cache
+from colorama import Fore, Style, init
+
+_colorama_initialized = False
+
+_LEVELS = {
+    name: getattr(logging, name)
+    for name in ("DEBUG", "INFO", "WARNING", "WARN", "ERROR", "CRITICAL", "FATAL")
+}
+
+# Log file of the first setup_logging call; later calls reuse it
+_configured_log_file = None
+
+_LOG_MAX_BYTES = 10 * 1024 * 1024
+_LOG_BACKUP_COUNT = 5
 
 
 def setup_logging(log_level="INFO", session_timestamp=None):
-    """Setup logging configuration with timestamped log files"""
-    level = getattr(logging, log_level.upper(), logging.INFO)
+    """Setup logging configuration with timestamped log files
+    
+    Only the first call opens a log file; later calls just apply log_level
+    and return that same file, ignoring session_timestamp.
+    """
+    global _configured_log_file
+    level_name = str(log_level).upper()
+    level = _LEVELS.get(level_name)
+    if level is None:
+        level = int(level_name) if level_name.isdigit() else None
+    
+    # Already configured: keep the open log file, just apply the level
+    logger = logging.getLogger()
+    if _configured_log_file is not None:
+        _apply_level(logger, level, log_level)
+        return logger, _configured_log_file
     
     # Create logs directory if it doesn't exist
     logs_dir = "logs"
@@ -28,18 +60,30 @@ def setup_logging(log_level="INFO", session_timestamp=None):
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    # Setup root logger
-    logger = logging.getLogger()
-    logger.setLevel(level)
-    
     # Clear any existing handlers
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        handler.close()
     
-    # File handler (always enabled with timestamped filename)
-    file_handler = logging.FileHandler(log_file)
+    # File handler (always enabled with timestamped filename), rotated so a
+    # long DEBUG session cannot fill the disk
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=_LOG_MAX_BYTES, backupCount=_LOG_BACKUP_COUNT, delay=True
+    )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    
+    # Callers only enqueue records; a listener thread does the file I/O. It is
+    # stopped at exit, ahead of logging's own shutdown, so queued records are flushed
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    _configured_log_file = log_file
+    
+    # Set the root level now that the file handler can record a bad-level warning
+    _apply_level(logger, level, log_level)
     
     # Log the setup info
     logger.info(f"Logging initialized - Log file: {log_file}")
@@ -47,36 +91,81 @@ def setup_logging(log_level="INFO", session_timestamp=None):
     return logger, log_file
 
 
+def _apply_level(logger, level, log_level):
+    """Set logger to level, falling back to INFO with a warning if it was not recognised"""
+    if level is None:
+        logger.setLevel(logging.INFO)
+        logger.warning("Unknown log level %r, using INFO", log_level)
+    else:
+        logger.setLevel(level)
+
+
+def ensure_colorama():
+    """Initialize colorama once, on first colored output to a terminal"""
+    global _colorama_initialized
+    if _colorama_initialized:
+        return
+    _colorama_initialized = True
+    
+    # Redirected output gets the raw ANSI codes; no need to wrap stdout
+    if sys.stdout.isatty():
+        init(autoreset=True)
+
+
+@lru_cache(maxsize=256)
+def _fmt_secs(total_seconds):
+    """Format whole seconds as H:MM:SS"""
+    minutes, seconds = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
 def format_duration(duration):
-    """Format timedelta to readable string"""
+    """Format a timedelta or a number of seconds to readable string"""
     if isinstance(duration, timedelta):
-        return str(duration).split('.')[0]
+        return _fmt_secs(int(duration.total_seconds()))
+    if isinstance(duration, (int, float)):
+        return _fmt_secs(int(duration))
     return str(duration)
 
 
 def clear_screen():
     """Clear the terminal screen"""
-    os.system('clear' if os.name == 'posix' else 'cls')
+    # colorama translates the ANSI codes for legacy Windows consoles
+    ensure_colorama()
+    sys.stdout.write("\x1b[H\x1b[2J")
+    sys.stdout.flush()
+
+
+@lru_cache(maxsize=16)
+def _bar(width):
+    """Colored '=' rule line of the given width"""
+    return f"{Fore.CYAN}{'='*width}{Style.RESET_ALL}\n"
+
+
+def format_header(title, width=60):
+    """Format a header as three newline-terminated lines"""
+    bar = _bar(width)
+    return f"{bar}{Fore.CYAN}{title.center(width)}{Style.RESET_ALL}\n{bar}"
 
 
 def print_header(title, width=60):
     """Print a formatted header"""
-    print(f"{Fore.CYAN}{'='*width}")
-    print(f"{Fore.CYAN}{title.center(width)}")
-    print(f"{Fore.CYAN}{'='*width}")
+    ensure_colorama()
+    sys.stdout.write(format_header(title, width))
 
 
 def validate_confidence(confidence):
     """Validate confidence threshold value"""
-    if not isinstance(confidence, (int, float)):
-        raise ValueError("Confidence must be a number")
-    if not 0.0 <= confidence <= 1.0:
-        raise ValueError("Confidence must be between 0.0 and 1.0")
-    return float(confidence)
+    try:
+        confidence = float(confidence)
+    except (TypeError, ValueError):
+        raise ValueError("Confidence must be a number") from None
+    if 0.0 <= confidence <= 1.0:
+        return confidence
+    raise ValueError("Confidence must be between 0.0 and 1.0")
 
 
 def safe_divide(numerator, denominator):
     """Safely divide two numbers, returning 0 if denominator is 0"""
-    if denominator == 0:
-        return 0
-    return numerator / denominator
+    return numerator / denominator if denominator else 0